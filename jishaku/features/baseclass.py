@@ -17,16 +17,21 @@ import contextlib
 import typing
 from datetime import datetime, timezone
 
+import discord
 from discord.ext import commands
 
 __all__ = (
     'Feature',
-    'CommandTask'
+    'CommandTask',
+    'SILENT_MENTIONS'
 )
 
 
 CommandTask = collections.namedtuple("CommandTask", "index ctx task")
 
+# Shared across feature replies so one isn't constructed per message, and so replies never ping anyone
+SILENT_MENTIONS = discord.AllowedMentions.none()
+
 
 class Feature(commands.Cog):
     """
@@ -60,6 +65,7 @@ class Feature(commands.Cog):
         self.bot: commands.Bot = kwargs.pop('bot')
         self.start_time: datetime = datetime.utcnow().replace(tzinfo=timezone.utc)
         self.tasks = collections.deque()
+        self._tasks_by_index: typing.Dict[int, CommandTask] = {}
         self.task_count: int = 0
 
         # Generate and attach commands
@@ -160,9 +166,15 @@ class Feature(commands.Cog):
         cmdtask = CommandTask(self.task_count, ctx, current_task)
 
         self.tasks.append(cmdtask)
+        self._tasks_by_index[cmdtask.index] = cmdtask
 
         try:
             yield cmdtask
         finally:
-            if cmdtask in self.tasks:
-                self.tasks.remove(cmdtask)
+            # The index is kept in sync with the task list, so this avoids scanning it for membership
+            if self._tasks_by_index.pop(cmdtask.index, None) is not None:
+                try:
+                    self.tasks.remove(cmdtask)
+                except ValueError:
+                    # The task list is public, so the task may have been removed from it directly
+                    pass
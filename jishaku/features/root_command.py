@@ -12,13 +12,15 @@ The jishaku root command.
 """
 
 import math
+import os
 import sys
+import time
 import typing
 
 import discord
 from discord.ext import commands
 
-from jishaku.features.baseclass import Feature
+from jishaku.features.baseclass import SILENT_MENTIONS, CommandTask, Feature
 from jishaku.flags import Flags
 from jishaku.modules import package_version
 from jishaku.paginators import PaginatorInterface
@@ -28,6 +30,16 @@ try:
 except ImportError:
     psutil = None
 
+# Computing USS means walking /proc/<pid>/smaps unless the kernel offers the much cheaper smaps_rollup,
+#  so on Linux systems without it only RSS/VMS are queried.
+USE_FULL_MEMORY_INFO = not sys.platform.startswith('linux') or os.path.exists('/proc/self/smaps_rollup')
+
+# How long (in seconds) a memory reading is reused for before querying the process again
+MEMORY_CACHE_TTL = 5
+
+# How long (in seconds) the deduplicated user count is reused for before being recounted
+USER_COUNT_CACHE_TTL = 30
+
 
 def natural_size(size_in_bytes: int):
     """
@@ -43,6 +55,15 @@ def natural_size(size_in_bytes: int):
     return f"{size_in_bytes / (1024 ** power):.2f} {units[power]}"
 
 
+def format_task_line(task: CommandTask) -> str:
+    """
+    Formats a line describing a jishaku command task.
+    """
+
+    return (f"{task.index}: `{task.ctx.command.qualified_name}`, invoked at "
+            f"{task.ctx.message.created_at.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+
+
 class RootCommand(Feature):
     """
     Feature containing the root jsk command
@@ -52,81 +73,54 @@ class RootCommand(Feature):
         super().__init__(*args, **kwargs)
         self.jsk.hidden = Flags.HIDE
 
-    @Feature.Command(name="jishaku", aliases=["jsk"],
-                     invoke_without_command=True, ignore_extra=False)
-    async def jsk(self, ctx: commands.Context):  # pylint: disable=too-many-branches
-        """
-        The Jishaku debug and diagnostic commands.
+        self._mem_cache: typing.Tuple[float, typing.Any] = (0.0, None)
+        self._user_count_cache: typing.Tuple[float, typing.Optional[int]] = (0.0, None)
+        self._shard_ids_str: typing.Optional[str] = None
 
-        This command on its own gives a status brief.
-        All other functionality is within its subcommands.
-        """
-
-        summary = [
-            f"Jishaku v{package_version('jishaku')}, Novus `{package_version('novus')}`, VoxelBotUtils `{package_version('voxelbotutils')}` "
-            f"`Python {sys.version}` on `{sys.platform}`".replace("\n", ""),
-            f"Module was loaded <t:{self.load_time.timestamp():.0f}:R>, "
-            f"cog was loaded <t:{self.start_time.timestamp():.0f}:R>.",
-            ""
-        ]
+        # Probe what process information is available once, rather than on every invocation.
+        # The process object is reused so psutil doesn't rebuild its process state every time.
+        self._psutil_proc = None
+        process_block_fallback = ""
 
-        # detect if [procinfo] feature is installed
         if psutil:
             try:
                 proc = psutil.Process()
 
+                # Memory info is left out, as being denied it only omits that line
                 with proc.oneshot():
-                    try:
-                        mem = proc.memory_full_info()
-                        summary.append(f"Using {natural_size(mem.rss)} physical memory and "
-                                       f"{natural_size(mem.vms)} virtual memory, "
-                                       f"{natural_size(mem.uss)} of which unique to this process.")
-                    except psutil.AccessDenied:
-                        pass
-
-                    try:
-                        name = proc.name()
-                        pid = proc.pid
-                        thread_count = proc.num_threads()
-
-                        summary.append(f"Running on PID {pid} (`{name}`) with {thread_count} thread(s).")
-                    except psutil.AccessDenied:
-                        pass
-
-                    summary.append("")  # blank line
+                    proc.name()
             except psutil.AccessDenied:
-                summary.append(
+                process_block_fallback = (
                     "psutil is installed, but this process does not have high enough access rights "
-                    "to query process information."
+                    "to query process information.\n\n"
                 )
-                summary.append("")  # blank line
-
-        cache_summary = f"{len(self.bot.guilds)} guild(s) and {len(self.bot.users)} user(s)"
+            else:
+                self._psutil_proc = proc
 
-        # Show shard settings to summary
+        # The sharding mode of the bot is fixed at construction
         if isinstance(self.bot, discord.AutoShardedClient):
-            if len(self.bot.shards) > 20:
-                summary.append(
-                    f"This bot is automatically sharded ({len(self.bot.shards)} shards of {self.bot.shard_count})"
-                    f" and can see {cache_summary}."
-                )
-            else:
-                shard_ids = ', '.join(str(i) for i in self.bot.shards.keys())
-                summary.append(
-                    f"This bot is automatically sharded (Shards {shard_ids} of {self.bot.shard_count})"
-                    f" and can see {cache_summary}."
-                )
+            self._format_shard_summary = self._format_autosharded_summary
         elif self.bot.shard_count:
-            summary.append(
-                f"This bot is manually sharded (Shard {self.bot.shard_id} of {self.bot.shard_count})"
-                f" and can see {cache_summary}."
-            )
+            self._format_shard_summary = self._format_manually_sharded_summary
         else:
-            summary.append(f"This bot is not sharded and can see {cache_summary}.")
+            self._format_shard_summary = self._format_unsharded_summary
+
+        # Everything before the shard line is fixed once the cog is loaded:
+        #  the versions can't change while the bot is running, and Discord renders
+        #  the load timestamps relative to the viewer, so the text never goes stale.
+        self._brief_header = (
+            f"Jishaku v{package_version('jishaku')}, Novus `{package_version('novus')}`, VoxelBotUtils `{package_version('voxelbotutils')}` "
+            f"`Python {sys.version}` on `{sys.platform}`".replace("\n", "") + "\n"
+            f"Module was loaded <t:{self.load_time.timestamp():.0f}:R>, "
+            f"cog was loaded <t:{self.start_time.timestamp():.0f}:R>.\n\n"
+            f"{process_block_fallback}"
+        )
+
+        # The message cache size and intents are both set when the client is constructed
+        max_messages = self.bot._connection.max_messages  # pylint: disable=protected-access
 
-        # pylint: disable=protected-access
-        if self.bot._connection.max_messages:
-            message_cache = f"Message cache capped at {self.bot._connection.max_messages}"
+        if max_messages:
+            message_cache = f"Message cache capped at {max_messages}"
         else:
             message_cache = "Message cache is disabled"
 
@@ -134,16 +128,144 @@ class RootCommand(Feature):
             presence_intent = f"presence intent is {'enabled' if self.bot.intents.presences else 'disabled'}"
             members_intent = f"members intent is {'enabled' if self.bot.intents.members else 'disabled'}"
 
-            summary.append(f"{message_cache}, {presence_intent} and {members_intent}.")
+            self._cache_line = f"{message_cache}, {presence_intent} and {members_intent}."
         else:
-            summary.append(f"{message_cache}.")
+            self._cache_line = f"{message_cache}."
 
-        # pylint: enable=protected-access
+    def _memory_info(self, proc):
+        """
+        Gets memory information for the given process, reusing a recent reading if one is available.
+        """
+
+        now = time.monotonic()
+        cached_at, mem = self._mem_cache
 
-        # Show websocket latency in milliseconds
-        summary.append(f"Average websocket latency: {round(self.bot.latency * 1000, 2)}ms")
+        if mem is None or now - cached_at >= MEMORY_CACHE_TTL:
+            mem = proc.memory_full_info() if USE_FULL_MEMORY_INFO else proc.memory_info()
+            self._mem_cache = (now, mem)
+
+        return mem
+
+    def _user_count(self) -> int:
+        """
+        Gets the number of users the bot can see, reusing a recent count if one is available.
 
-        await ctx.send("\n".join(summary))
+        Counting users requires deduplicating every member across every guild, so this is kept off the hot path.
+        """
+
+        now = time.monotonic()
+        cached_at, count = self._user_count_cache
+
+        if count is None or now - cached_at >= USER_COUNT_CACHE_TTL:
+            count = len(self.bot.users)
+            self._user_count_cache = (now, count)
+
+        return count
+
+    def _format_process_block(self) -> str:
+        """
+        Formats the process information section of the jsk brief.
+        """
+
+        proc = self._psutil_proc
+        process_lines = []
+
+        with proc.oneshot():
+            try:
+                mem = self._memory_info(proc)
+            except psutil.AccessDenied:
+                mem = None
+
+            # Memory is left out of this as it has its own cache
+            info = proc.as_dict(attrs=['name', 'num_threads'], ad_value=None)
+
+        if mem is not None:
+            if hasattr(mem, 'uss'):
+                process_lines.append(f"Using {natural_size(mem.rss)} physical memory and "
+                                     f"{natural_size(mem.vms)} virtual memory, "
+                                     f"{natural_size(mem.uss)} of which unique to this process.")
+            else:
+                process_lines.append(f"Using {natural_size(mem.rss)} physical memory and "
+                                     f"{natural_size(mem.vms)} virtual memory.")
+
+        if info['name'] is not None and info['num_threads'] is not None:
+            process_lines.append(f"Running on PID {proc.pid} (`{info['name']}`) with {info['num_threads']} thread(s).")
+
+        return "\n".join(process_lines) + "\n\n" if process_lines else ""
+
+    def _format_autosharded_summary(self, cache_summary: str) -> str:
+        """
+        Formats the shard line of the jsk brief for an AutoShardedClient.
+        """
+
+        if len(self.bot.shards) > 20:
+            return (
+                f"This bot is automatically sharded ({len(self.bot.shards)} shards of {self.bot.shard_count})"
+                f" and can see {cache_summary}."
+            )
+
+        if self._shard_ids_str is None:
+            self._shard_ids_str = ', '.join(map(str, self.bot.shards))
+
+        return (
+            f"This bot is automatically sharded (Shards {self._shard_ids_str} of {self.bot.shard_count})"
+            f" and can see {cache_summary}."
+        )
+
+    def _format_manually_sharded_summary(self, cache_summary: str) -> str:
+        """
+        Formats the shard line of the jsk brief for a manually sharded bot.
+        """
+
+        return (
+            f"This bot is manually sharded (Shard {self.bot.shard_id} of {self.bot.shard_count})"
+            f" and can see {cache_summary}."
+        )
+
+    def _format_unsharded_summary(self, cache_summary: str) -> str:
+        """
+        Formats the shard line of the jsk brief for an unsharded bot.
+        """
+
+        return f"This bot is not sharded and can see {cache_summary}."
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int):  # pylint: disable=unused-argument
+        """
+        Invalidates the cached shard ID list, as the set of shards may have changed.
+        """
+
+        self._shard_ids_str = None
+
+    @Feature.Command(name="jishaku", aliases=["jsk"],
+                     invoke_without_command=True, ignore_extra=False)
+    async def jsk(self, ctx: commands.Context):
+        """
+        The Jishaku debug and diagnostic commands.
+
+        This command on its own gives a status brief.
+        All other functionality is within its subcommands.
+        """
+
+        # detect if [procinfo] feature is installed and usable
+        if self._psutil_proc is not None:
+            process_block = self._format_process_block()
+        else:
+            process_block = ""
+
+        cache_summary = f"{len(self.bot.guilds)} guild(s) and {self._user_count()} user(s)"
+
+        shard_block = self._format_shard_summary(cache_summary)
+
+        await ctx.send(
+            f"{self._brief_header}"
+            f"{process_block}"
+            f"{shard_block}\n"
+            f"{self._cache_line}\n"
+            # Show websocket latency in milliseconds
+            f"Average websocket latency: {round(self.bot.latency * 1000, 2)}ms",
+            allowed_mentions=SILENT_MENTIONS
+        )
 
     # pylint: disable=no-member
     @Feature.Command(parent="jsk", name="hide")
@@ -153,10 +275,10 @@ class RootCommand(Feature):
         """
 
         if self.jsk.hidden:
-            return await ctx.send("Jishaku is already hidden.")
+            return await ctx.send("Jishaku is already hidden.", allowed_mentions=SILENT_MENTIONS)
 
         self.jsk.hidden = True
-        await ctx.send("Jishaku is now hidden.")
+        await ctx.send("Jishaku is now hidden.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk", name="show")
     async def jsk_show(self, ctx: commands.Context):
@@ -165,10 +287,10 @@ class RootCommand(Feature):
         """
 
         if not self.jsk.hidden:
-            return await ctx.send("Jishaku is already visible.")
+            return await ctx.send("Jishaku is already visible.", allowed_mentions=SILENT_MENTIONS)
 
         self.jsk.hidden = False
-        await ctx.send("Jishaku is now visible.")
+        await ctx.send("Jishaku is now visible.", allowed_mentions=SILENT_MENTIONS)
     # pylint: enable=no-member
 
     @Feature.Command(parent="jsk", name="tasks")
@@ -178,13 +300,12 @@ class RootCommand(Feature):
         """
 
         if not self.tasks:
-            return await ctx.send("No currently running tasks.")
+            return await ctx.send("No currently running tasks.", allowed_mentions=SILENT_MENTIONS)
 
         paginator = commands.Paginator(max_size=1985)
 
         for task in self.tasks:
-            paginator.add_line(f"{task.index}: `{task.ctx.command.qualified_name}`, invoked at "
-                               f"{task.ctx.message.created_at.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+            paginator.add_line(format_task_line(task))
 
         interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
         return await interface.send_to(ctx)
@@ -198,30 +319,33 @@ class RootCommand(Feature):
         """
 
         if not self.tasks:
-            return await ctx.send("No tasks to cancel.")
+            return await ctx.send("No tasks to cancel.", allowed_mentions=SILENT_MENTIONS)
 
         if index == "~":
-            task_count = len(self.tasks)
+            # Clear the task list before cancelling so that tasks unwinding don't need to remove themselves from it
+            snapshot = list(self.tasks)
+            self.tasks.clear()
+            self._tasks_by_index.clear()
 
-            for task in self.tasks:
+            for task in snapshot:
                 task.task.cancel()
 
-            self.tasks.clear()
-
-            return await ctx.send(f"Cancelled {task_count} tasks.")
+            return await ctx.send(f"Cancelled {len(snapshot)} tasks.", allowed_mentions=SILENT_MENTIONS)
 
         if isinstance(index, str):
             raise commands.BadArgument('Literal for "index" not recognized.')
 
         if index == -1:
             task = self.tasks.pop()
+            self._tasks_by_index.pop(task.index, None)
         else:
-            task = discord.utils.get(self.tasks, index=index)
-            if task:
+            # The task list is public, so it may have been changed without the index being updated
+            task = self._tasks_by_index.pop(index, None) or discord.utils.get(self.tasks, index=index)
+
+            try:
                 self.tasks.remove(task)
-            else:
-                return await ctx.send("Unknown task.")
+            except ValueError:
+                return await ctx.send("Unknown task.", allowed_mentions=SILENT_MENTIONS)
 
         task.task.cancel()
-        return await ctx.send(f"Cancelled task {task.index}: `{task.ctx.command.qualified_name}`,"
-                              f" invoked at {task.ctx.message.created_at.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        return await ctx.send(f"Cancelled task {format_task_line(task)}", allowed_mentions=SILENT_MENTIONS)
@@ -18,7 +18,30 @@ import discord.opus
 import discord.voice_client
 from discord.ext import commands
 
-from jishaku.features.baseclass import Feature
+from jishaku.features.baseclass import SILENT_MENTIONS, Feature
+from jishaku.functools import executor_function
+
+
+def strip_embed_maskers(uri: str) -> str:
+    """
+    Removes a surrounding pair of <> embed maskers from a URI, if present.
+    """
+
+    if len(uri) >= 2 and uri[0] == "<" and uri[-1] == ">":
+        return uri[1:-1]
+
+    return uri
+
+
+@executor_function
+def create_audio_source(uri: str) -> discord.PCMVolumeTransformer:
+    """
+    Creates a volume-adjustable FFmpeg audio source for the given URI.
+
+    This spawns an FFmpeg process, so it is run in an executor to avoid blocking the event loop.
+    """
+
+    return discord.PCMVolumeTransformer(discord.FFmpegPCMAudio(uri))
 
 
 class VoiceFeature(Feature):
@@ -26,34 +49,52 @@ class VoiceFeature(Feature):
     Feature containing the core voice-related commands
     """
 
+    # Once voice has been found usable it stays that way for the lifetime of the process
+    _voice_ready: typing.Optional[bool] = None
+
     @staticmethod
     async def voice_check(ctx: commands.Context):
         """
         Check for whether VC is available in this bot.
         """
 
+        if VoiceFeature._voice_ready:
+            return None
+
         if not discord.voice_client.has_nacl:
-            return await ctx.send("Voice cannot be used because PyNaCl is not loaded.")
+            return await ctx.send("Voice cannot be used because PyNaCl is not loaded.", allowed_mentions=SILENT_MENTIONS)
 
         if not discord.opus.is_loaded():
             if hasattr(discord.opus, '_load_default'):
                 if not discord.opus._load_default():  # pylint: disable=protected-access,no-member
                     return await ctx.send(
-                        "Voice cannot be used because libopus is not loaded and attempting to load the default failed."
+                        "Voice cannot be used because libopus is not loaded and attempting to load the default failed.",
+                        allowed_mentions=SILENT_MENTIONS
                     )
             else:
-                return await ctx.send("Voice cannot be used because libopus is not loaded.")
+                return await ctx.send("Voice cannot be used because libopus is not loaded.", allowed_mentions=SILENT_MENTIONS)
+
+        VoiceFeature._voice_ready = True
+        return None
 
     @staticmethod
-    async def connected_check(ctx: commands.Context):
+    def _is_connected(ctx: commands.Context) -> bool:
         """
-        Check whether we are connected to VC in this guild.
+        Returns whether we are connected to VC in this guild.
         """
 
         voice = ctx.guild.voice_client
 
-        if not voice or not voice.is_connected():
-            return await ctx.send("Not connected to a voice channel in this guild.")
+        return bool(voice and voice.is_connected())
+
+    @staticmethod
+    async def connected_check(ctx: commands.Context):
+        """
+        Check whether we are connected to VC in this guild.
+        """
+
+        if not VoiceFeature._is_connected(ctx):
+            return await ctx.send("Not connected to a voice channel in this guild.", allowed_mentions=SILENT_MENTIONS)
 
     @staticmethod
     async def playing_check(ctx: commands.Context):
@@ -63,12 +104,38 @@ class VoiceFeature(Feature):
         This doubles up as a connection check.
         """
 
-        check = await VoiceFeature.connected_check(ctx)
-        if check:
-            return check
+        if not VoiceFeature._is_connected(ctx):
+            # Only reached when not connected, so this just sends the message
+            return await VoiceFeature.connected_check(ctx)
 
         if not ctx.guild.voice_client.is_playing():
-            return await ctx.send("The voice client in this guild is not playing anything.")
+            return await ctx.send("The voice client in this guild is not playing anything.", allowed_mentions=SILENT_MENTIONS)
+
+    @staticmethod
+    async def play_source(ctx: commands.Context, source: discord.AudioSource) -> typing.Optional[discord.VoiceClient]:
+        """
+        Plays an audio source in this guild, stopping anything that is already playing.
+
+        The connection is checked again here, as it may have changed while the source was being created.
+        If the source can't be played, it is cleaned up so its FFmpeg process isn't left behind.
+        """
+
+        if await VoiceFeature.connected_check(ctx):
+            source.cleanup()
+            return None
+
+        voice = ctx.guild.voice_client
+
+        if voice.is_playing():
+            voice.stop()
+
+        try:
+            voice.play(source)
+        except discord.ClientException:
+            source.cleanup()
+            raise
+
+        return voice
 
     @Feature.Command(parent="jsk", name="voice", aliases=["vc"],
                      invoke_without_command=True, ignore_extra=False)
@@ -86,10 +153,11 @@ class VoiceFeature(Feature):
         voice = ctx.guild.voice_client
 
         if not voice or not voice.is_connected():
-            return await ctx.send("Not connected.")
+            return await ctx.send("Not connected.", allowed_mentions=SILENT_MENTIONS)
 
         await ctx.send(f"Connected to {voice.channel.name}, "
-                       f"{'paused' if voice.is_paused() else 'playing' if voice.is_playing() else 'idle'}.")
+                       f"{'paused' if voice.is_paused() else 'playing' if voice.is_playing() else 'idle'}.",
+                       allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="join", aliases=["connect"])
     async def jsk_vc_join(self, ctx: commands.Context, *,
@@ -111,7 +179,7 @@ class VoiceFeature(Feature):
             if destination.voice and destination.voice.channel:
                 destination = destination.voice.channel
             else:
-                return await ctx.send("Member has no voice channel.")
+                return await ctx.send("Member has no voice channel.", allowed_mentions=SILENT_MENTIONS)
 
         voice = ctx.guild.voice_client
 
@@ -120,7 +188,7 @@ class VoiceFeature(Feature):
         else:
             await destination.connect(reconnect=True)
 
-        await ctx.send(f"Connected to {destination.name}.")
+        await ctx.send(f"Connected to {destination.name}.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="disconnect", aliases=["dc"])
     async def jsk_vc_disconnect(self, ctx: commands.Context):
@@ -134,7 +202,7 @@ class VoiceFeature(Feature):
         voice = ctx.guild.voice_client
 
         await voice.disconnect()
-        await ctx.send(f"Disconnected from {voice.channel.name}.")
+        await ctx.send(f"Disconnected from {voice.channel.name}.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="stop")
     async def jsk_vc_stop(self, ctx: commands.Context):
@@ -148,7 +216,7 @@ class VoiceFeature(Feature):
         voice = ctx.guild.voice_client
 
         voice.stop()
-        await ctx.send(f"Stopped playing audio in {voice.channel.name}.")
+        await ctx.send(f"Stopped playing audio in {voice.channel.name}.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="pause")
     async def jsk_vc_pause(self, ctx: commands.Context):
@@ -162,10 +230,10 @@ class VoiceFeature(Feature):
         voice = ctx.guild.voice_client
 
         if voice.is_paused():
-            return await ctx.send("Audio is already paused.")
+            return await ctx.send("Audio is already paused.", allowed_mentions=SILENT_MENTIONS)
 
         voice.pause()
-        await ctx.send(f"Paused audio in {voice.channel.name}.")
+        await ctx.send(f"Paused audio in {voice.channel.name}.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="resume")
     async def jsk_vc_resume(self, ctx: commands.Context):
@@ -179,10 +247,10 @@ class VoiceFeature(Feature):
         voice = ctx.guild.voice_client
 
         if not voice.is_paused():
-            return await ctx.send("Audio is not paused.")
+            return await ctx.send("Audio is not paused.", allowed_mentions=SILENT_MENTIONS)
 
         voice.resume()
-        await ctx.send(f"Resumed audio in {voice.channel.name}.")
+        await ctx.send(f"Resumed audio in {voice.channel.name}.", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="volume")
     async def jsk_vc_volume(self, ctx: commands.Context, *, percentage: float):
@@ -199,11 +267,12 @@ class VoiceFeature(Feature):
 
         if not isinstance(source, discord.PCMVolumeTransformer):
             return await ctx.send("This source doesn't support adjusting volume or "
-                                  "the interface to do so is not exposed.")
+                                  "the interface to do so is not exposed.",
+                                  allowed_mentions=SILENT_MENTIONS)
 
         source.volume = volume
 
-        await ctx.send(f"Volume set to {volume * 100:.2f}%")
+        await ctx.send(f"Volume set to {volume * 100:.2f}%", allowed_mentions=SILENT_MENTIONS)
 
     @Feature.Command(parent="jsk_voice", name="play", aliases=["play_local"])
     async def jsk_vc_play(self, ctx: commands.Context, *, uri: str):
@@ -216,13 +285,7 @@ class VoiceFeature(Feature):
         if await self.connected_check(ctx):
             return
 
-        voice = ctx.guild.voice_client
+        voice = await self.play_source(ctx, await create_audio_source(strip_embed_maskers(uri)))
 
-        if voice.is_playing():
-            voice.stop()
-
-        # remove embed maskers if present
-        uri = uri.lstrip("<").rstrip(">")
-
-        voice.play(discord.PCMVolumeTransformer(discord.FFmpegPCMAudio(uri)))
-        await ctx.send(f"Playing in {voice.channel.name}.")
+        if voice:
+            await ctx.send(f"Playing in {voice.channel.name}.", allowed_mentions=SILENT_MENTIONS)
@@ -16,7 +16,8 @@ import youtube_dl
 from discord.ext import commands
 
 from jishaku.features.baseclass import Feature
-from jishaku.features.voice import VoiceFeature
+from jishaku.features.voice import VoiceFeature, strip_embed_maskers
+from jishaku.functools import executor_function
 
 BASIC_OPTS = {
     'format': 'webm[abr>0]/bestaudio/best',
@@ -36,6 +37,17 @@ class BasicYouTubeDLSource(discord.FFmpegPCMAudio):
         super().__init__(info['url'])
 
 
+@executor_function
+def create_youtube_dl_source(url: str) -> discord.PCMVolumeTransformer:
+    """
+    Creates a volume-adjustable audio source for a youtube_dl-compatible URL.
+
+    Extracting the stream URL and spawning FFmpeg both block, so this is run in an executor.
+    """
+
+    return discord.PCMVolumeTransformer(BasicYouTubeDLSource(url))
+
+
 class YouTubeFeature(Feature):
     """
     Feature containing the youtube-dl command
@@ -53,13 +65,7 @@ class YouTubeFeature(Feature):
         if not youtube_dl:
             return await ctx.send("youtube_dl is not installed.")
 
-        voice = ctx.guild.voice_client
-
-        if voice.is_playing():
-            voice.stop()
-
-        # remove embed maskers if present
-        url = url.lstrip("<").rstrip(">")
+        voice = await VoiceFeature.play_source(ctx, await create_youtube_dl_source(strip_embed_maskers(url)))
 
-        voice.play(discord.PCMVolumeTransformer(BasicYouTubeDLSource(url)))
-        await ctx.send(f"Playing in {voice.channel.name}.")
+        if voice:
+            await ctx.send(f"Playing in {voice.channel.name}.")
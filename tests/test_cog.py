@@ -10,11 +10,18 @@ jishaku.cog loadability and functionality test
 """
 
 import asyncio
+from unittest import mock
 
+import discord.opus
+import discord.voice_client
 import pytest
 import utils
 from discord.ext import commands
 
+from jishaku.features import root_command
+from jishaku.features.baseclass import CommandTask
+from jishaku.features.voice import VoiceFeature, strip_embed_maskers
+
 
 @pytest.fixture(
     scope='module',
@@ -66,21 +73,133 @@ def test_cog_attributes(bot):
 
     with cog.submit("mock 1") as cmd_task:
         assert len(cog.tasks) == 1
+        assert cog._tasks_by_index == {cmd_task.index: cmd_task}
 
         assert cmd_task.index == 1
         assert cmd_task.ctx == "mock 1"
         assert cmd_task.task is None
 
     assert not cog.tasks
+    assert not cog._tasks_by_index
 
     with cog.submit("mock 2") as cmd_task:
         assert len(cog.tasks) == 1
+        assert cog._tasks_by_index == {cmd_task.index: cmd_task}
 
         assert cmd_task.index == 2
         assert cmd_task.ctx == "mock 2"
         assert cmd_task.task is None
 
     assert not cog.tasks
+    assert not cog._tasks_by_index
+
+
+def test_memory_info_cache(bot):
+    cog = bot.get_cog("Jishaku")
+
+    with mock.patch.object(cog, '_mem_cache', (0.0, None)):
+        proc = mock.MagicMock(name='proc')
+        query = proc.memory_full_info if root_command.USE_FULL_MEMORY_INFO else proc.memory_info
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0):
+            cog._memory_info(proc)
+
+        assert query.call_count == 1
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0 + root_command.MEMORY_CACHE_TTL - 1):
+            cog._memory_info(proc)
+
+        assert query.call_count == 1, "Memory info should be reused within the TTL"
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0 + root_command.MEMORY_CACHE_TTL):
+            cog._memory_info(proc)
+
+        assert query.call_count == 2, "Memory info should be refreshed after the TTL"
+
+
+def test_user_count_cache(bot):
+    cog = bot.get_cog("Jishaku")
+
+    with mock.patch.object(cog, '_user_count_cache', (0.0, None)), \
+         mock.patch.object(type(bot), 'users', new_callable=mock.PropertyMock) as users:
+        users.return_value = [1, 2, 3]
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0):
+            assert cog._user_count() == 3
+
+        users.return_value = [1, 2, 3, 4]
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0 + root_command.USER_COUNT_CACHE_TTL - 1):
+            assert cog._user_count() == 3, "User count should be reused within the TTL"
+
+        with mock.patch.object(root_command.time, 'monotonic', return_value=1000.0 + root_command.USER_COUNT_CACHE_TTL):
+            assert cog._user_count() == 4, "User count should be refreshed after the TTL"
+
+
+@utils.run_async
+async def test_shard_ready_invalidation(bot):
+    cog = bot.get_cog("Jishaku")
+    cog._shard_ids_str = "0, 1"
+
+    await cog.on_shard_ready(0)
+
+    assert cog._shard_ids_str is None
+
+
+@utils.run_async
+async def test_voice_check_cache():
+    with utils.mock_ctx() as ctx:
+        with mock.patch.object(VoiceFeature, '_voice_ready', True), \
+             mock.patch.object(discord.voice_client, 'has_nacl', False), \
+             mock.patch.object(discord.opus, 'is_loaded') as is_loaded:
+            assert await VoiceFeature.voice_check(ctx) is None
+
+            is_loaded.assert_not_called()
+            ctx.send.assert_not_called()
+
+    with utils.mock_ctx() as ctx:
+        # a failed probe should be retried on the next check
+        with mock.patch.object(VoiceFeature, '_voice_ready', None), \
+             mock.patch.object(discord.voice_client, 'has_nacl', False), \
+             mock.patch.object(discord.opus, 'is_loaded', return_value=True):
+            assert await VoiceFeature.voice_check(ctx)
+            assert not VoiceFeature._voice_ready
+
+            ctx.send.assert_called_once()
+
+            with mock.patch.object(discord.voice_client, 'has_nacl', True):
+                assert await VoiceFeature.voice_check(ctx) is None
+
+            assert VoiceFeature._voice_ready is True
+            ctx.send.assert_called_once()
+
+    with utils.mock_ctx() as ctx:
+        # a successful probe should be remembered
+        with mock.patch.object(VoiceFeature, '_voice_ready', None), \
+             mock.patch.object(discord.voice_client, 'has_nacl', True), \
+             mock.patch.object(discord.opus, 'is_loaded', return_value=True) as is_loaded:
+            assert await VoiceFeature.voice_check(ctx) is None
+            assert VoiceFeature._voice_ready is True
+
+            assert await VoiceFeature.voice_check(ctx) is None
+            is_loaded.assert_called_once()
+            ctx.send.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("uri", "expected"),
+    [
+        ("https://example.com/audio.mp3", "https://example.com/audio.mp3"),
+        ("<https://example.com/audio.mp3>", "https://example.com/audio.mp3"),
+        ("<<https://example.com/audio.mp3>>", "<https://example.com/audio.mp3>"),
+        ("<https://example.com/audio.mp3", "<https://example.com/audio.mp3"),
+        ("https://example.com/audio.mp3>", "https://example.com/audio.mp3>"),
+        ("<>", ""),
+        ("<", "<"),
+    ]
+)
+def test_strip_embed_maskers(uri, expected):
+    assert strip_embed_maskers(uri) == expected
 
 
 @utils.run_async
@@ -178,6 +297,9 @@ async def test_commands(bot):
             text = ctx.send.call_args[0][0]
             assert f"Cancelled task {command_task.index}" in text
 
+            assert command_task not in cog.tasks
+            assert command_task.index not in cog._tasks_by_index
+
     with utils.mock_ctx() as ctx:
         # test implicit
         with cog.submit(ctx) as command_task:
@@ -189,6 +311,9 @@ async def test_commands(bot):
             text = ctx.send.call_args[0][0]
             assert f"Cancelled task {command_task.index}" in text
 
+            assert command_task not in cog.tasks
+            assert command_task.index not in cog._tasks_by_index
+
     with utils.mock_ctx() as ctx:
         # test unknown task
         with cog.submit(ctx) as command_task:
@@ -198,6 +323,63 @@ async def test_commands(bot):
             text = ctx.send.call_args[0][0]
             assert "Unknown task" in text
 
+            assert list(cog._tasks_by_index.values()) == list(cog.tasks)
+
+    assert not cog.tasks
+    assert not cog._tasks_by_index
+
+    with utils.mock_ctx() as ctx:
+        # test a task removed from the task list directly
+        with cog.submit(ctx) as command_task:
+            cog.tasks.remove(command_task)
+
+        assert not cog._tasks_by_index
+
+    with utils.mock_ctx() as ctx:
+        # test cancelling a task removed from the task list directly
+        with cog.submit(ctx), cog.submit(ctx) as command_task:
+            cog.tasks.remove(command_task)
+
+            await bot.get_command('jsk cancel').callback(cog, ctx, index=command_task.index)
+
+            ctx.send.assert_called_once()
+            text = ctx.send.call_args[0][0]
+            assert "Unknown task" in text
+
+            assert command_task.index not in cog._tasks_by_index
+
+    with utils.mock_ctx() as ctx:
+        # test cancelling a task added to the task list directly
+        command_task = CommandTask(utils.sentinel(), ctx, mock.MagicMock(name='task'))
+        cog.tasks.append(command_task)
+
+        await bot.get_command('jsk cancel').callback(cog, ctx, index=command_task.index)
+
+        command_task.task.cancel.assert_called_once()
+        ctx.send.assert_called_once()
+        text = ctx.send.call_args[0][0]
+        assert f"Cancelled task {command_task.index}" in text
+
+        assert command_task not in cog.tasks
+
+    with utils.mock_ctx() as ctx:
+        # test cancelling all tasks
+        with cog.submit(ctx), cog.submit(ctx), cog.submit(ctx):
+            with pytest.raises(asyncio.CancelledError):
+                await bot.get_command('jsk cancel').callback(cog, ctx, index="~")
+
+                assert not cog.tasks
+                assert not cog._tasks_by_index
+
+                await asyncio.sleep(0.1)
+
+            ctx.send.assert_called_once()
+            text = ctx.send.call_args[0][0]
+            assert "Cancelled 3 tasks" in text
+
+            assert not cog.tasks
+            assert not cog._tasks_by_index
+
     with utils.mock_ctx() as ctx:
         # test no tasks
         await bot.get_command('jsk cancel').callback(cog, ctx, index=123456789012345678)